@@ -1,10 +1,14 @@
+import hashlib
 import json
+import operator
 import os
+import re
 import sys
+import threading
+import time
 import tkinter as tk
 import tkinter.font as tkfont
 from dataclasses import dataclass, asdict
-from datetime import datetime
 from pathlib import Path
 from tkinter import messagebox, filedialog
 
@@ -13,6 +17,11 @@ try:
 except Exception:  # Module might be missing; handled later
     OpenAI = None
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
 
 DATA_PATH = Path(__file__).parent / "data" / "items.json"
 API_KEY_PATH = Path(__file__).parent / "api_key.txt"
@@ -20,9 +29,18 @@ CANVAS_WIDTH = 900
 CANVAS_HEIGHT = 550
 DOT_RADIUS = 10
 MODEL_NAME = "gpt-4o-mini"
+POLL_MIN_MS = 500
+POLL_MAX_MS = 8000
+POLL_PAUSED_MS = 5000
+CHAT_MAX_LINES = 500
+HISTORY_MAX_MESSAGES = 20
 
+# "quota" also covers "insufficient_quota".
+_QUOTA_RE = re.compile(r"quota", re.IGNORECASE)
+_AUTH_RE = re.compile(r"\b401\b|invalid_api_key", re.IGNORECASE)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class DeskItem:
     timestamp: str
     name: str
@@ -30,31 +48,91 @@ class DeskItem:
     y: float
     color: str
 
-    @classmethod
-    def from_dict(cls, data: dict) -> "DeskItem":
-        return cls(
-            timestamp=data.get("timestamp") or "",
-            name=data.get("name") or "",
-            x=float(data.get("x", 0)),
-            y=float(data.get("y", 0)),
-            color=data.get("color") or "",
-        )
-
     def to_dict(self) -> dict:
         return asdict(self)
 
 
+def _item_from_dict(data: dict, _get=dict.get) -> DeskItem:
+    # Positional args and a bound dict.get keep the bulk-load loop lean.
+    if not isinstance(data, dict):
+        raise TypeError(
+            f"each item must be a JSON object, got {type(data).__name__}")
+    return DeskItem(
+        _get(data, "timestamp") or "",
+        _get(data, "name") or "",
+        float(_get(data, "x", 0)),
+        float(_get(data, "y", 0)),
+        _get(data, "color") or "",
+    )
+
+
+# Pulls an item's fields as one tuple in C; used when formatting rows in bulk.
+_ITEM_FIELDS = operator.attrgetter("timestamp", "name", "x", "y", "color")
+# Prompt row template; one %-format call per row does all float conversion in C.
+_ITEM_ROW = "%d. %s | color: %s | pos: (%.3f, %.3f) | placed: %s"
+
+
+def _dump_items(items: list[DeskItem]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            items, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    data = [item.to_dict() for item in items]
+    return (json.dumps(data, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def _load_items_data(raw: bytes) -> list:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _fingerprint(raw: bytes) -> bytes:
+    return hashlib.blake2b(raw, digest_size=8).digest()
+
+
+def _now_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime())
+
+
 class DeskApp(tk.Tk):
+    # OpenAI clients (or None on failure) keyed by the resolved API key.
+    _client_cache: dict[str, object] = {}
+
     def __init__(self):
         super().__init__()
         self.title("Desk Items Viewer")
         self.configure(bg="black")
         self.client = self._init_openai_client()
         self.items: list[DeskItem] = []
-        self.last_loaded_mtime: float | None = None
+        self._items_desc_cache: str | None = None
+        self._system_msg = {
+            "role": "system",
+            "content": "You are a concise assistant. Answer only the user's question using the desk items context. Do not add extra commentary.",
+        }
+        self._history: list[dict] = [self._system_msg]
+        self._items_msg: dict | None = None
+        self._items_hash: int | None = None
+        self._drawn_items: list[DeskItem] = []
+        self._item_ids: list[tuple[int, int]] = []
+        self._border_id: int | None = None
+        self._redraw_scheduled = False
+        self._scroll_scheduled = False
+        self._pending_click: tuple[float, float] | None = None
+        self.last_loaded_mtime_ns: int | None = None
+        self._last_loaded_size: int | None = None
+        self._last_loaded_digest: bytes | None = None
+        self._poll_interval_ms = POLL_MIN_MS
+        self._idle_ticks = 0
+        self._watch_paused = False
 
         self.base_family = self._setup_fonts()
-        self.ui_font = (self.base_family, 12)
+        self.ui_font = self._named_ui_font
+        self._sync_items = self._make_sync(
+            canvas_width=CANVAS_WIDTH,
+            canvas_height=CANVAS_HEIGHT,
+            dot_r=DOT_RADIUS,
+            font=self.ui_font,
+        )
 
         self._build_ui()
         self._load_initial_items()
@@ -62,7 +140,7 @@ class DeskApp(tk.Tk):
 
     def _setup_fonts(self) -> str:
         # Pick a Chinese-friendly font to avoid亂碼/缺字.
-        preferred = [
+        preferred_cjk = [
             "Noto Sans CJK TC",
             "Noto Sans TC",
             "Source Han Sans TC",
@@ -71,9 +149,8 @@ class DeskApp(tk.Tk):
             "Taipei Sans TC Beta",
             "PingFang TC",
             "Microsoft JhengHei",
-            "Arial",
-            "Helvetica",
         ]
+        preferred = preferred_cjk + ["Arial", "Helvetica"]
         # X11 core fonts (non-Xft) fallback list for environments where tkfont.families() is limited.
         preferred_xcore = [
             "song ti",
@@ -83,33 +160,28 @@ class DeskApp(tk.Tk):
             "clearlyu",
         ]
         available = set(tkfont.families())
+        default_family = tkfont.nametofont("TkDefaultFont").actual("family")
 
-        def try_font(name: str) -> str | None:
-            if not name:
-                return None
-            try:
-                tkfont.Font(family=name, size=12)
-                return name
-            except tk.TclError:
-                return None
-
+        # Membership checks only; Tk substitutes a fallback for unknown families
+        # anyway, so the only Font built is the shared DeskUIFont below.
         family = None
-        for candidate in preferred:
-            if candidate in available and try_font(candidate):
-                family = candidate
-                break
-        if family is None:
-            for candidate in preferred_xcore:
-                if candidate in available and try_font(candidate):
+        if default_family in available and default_family in preferred_cjk:
+            family = default_family
+        else:
+            for candidate in preferred + preferred_xcore:
+                if candidate in available:
                     family = candidate
                     break
         if family is None:
-            family = tkfont.nametofont("TkDefaultFont").actual("family")
+            family = default_family
 
         tkfont.nametofont("TkDefaultFont").config(family=family, size=12)
         tkfont.nametofont("TkTextFont").config(family=family, size=12)
         tkfont.nametofont("TkMenuFont").config(family=family, size=12)
         tkfont.nametofont("TkHeadingFont").config(family=family, size=12)
+        # One named Tk font shared by every control; configure() restyles all.
+        self._named_ui_font = tkfont.Font(
+            family=family, size=12, name="DeskUIFont", exists=False)
         return family
 
     def _build_ui(self) -> None:
@@ -175,7 +247,7 @@ class DeskApp(tk.Tk):
 
         tk.Label(frame, text="Placed time (ISO)", **label_cfg).pack(fill="x")
         self.time_var = tk.StringVar(
-            value=datetime.now().isoformat(timespec="seconds"))
+            value=_now_iso())
         tk.Entry(frame, textvariable=self.time_var, **
                  entry_cfg).pack(fill="x", pady=(0, 6))
 
@@ -223,8 +295,9 @@ class DeskApp(tk.Tk):
 
         send_frame = tk.Frame(frame, bg="black")
         send_frame.pack(fill="x", pady=(0, 10))
-        tk.Button(send_frame, text="Send", command=self._send_question,
-                  **button_style).pack(fill="x")
+        self.send_btn = tk.Button(send_frame, text="Send", command=self._send_question,
+                                  **button_style)
+        self.send_btn.pack(fill="x")
 
         tk.Label(frame, text="Chat", **label_cfg).pack(fill="x", pady=(8, 0))
         self.response_box = tk.Text(
@@ -247,7 +320,8 @@ class DeskApp(tk.Tk):
             self._load_from_path()
         else:
             self.items = []
-            self._redraw_canvas()
+            self._items_desc_cache = None
+            self._request_redraw()
 
     def _choose_file(self) -> None:
         selected = filedialog.askopenfilename(
@@ -262,6 +336,16 @@ class DeskApp(tk.Tk):
     def _handle_canvas_click(self, event) -> None:
         x_norm = round(event.x / CANVAS_WIDTH, 3)
         y_norm = round(event.y / CANVAS_HEIGHT, 3)
+        # Only the latest click per event-loop turn reaches the StringVars.
+        if self._pending_click is None:
+            self.after_idle(self._flush_click)
+        self._pending_click = (x_norm, y_norm)
+
+    def _flush_click(self) -> None:
+        if self._pending_click is None:
+            return
+        x_norm, y_norm = self._pending_click
+        self._pending_click = None
         self.x_var.set(str(x_norm))
         self.y_var.set(str(y_norm))
         self.status_var.set(f"Selected: x={x_norm}, y={y_norm}")
@@ -269,7 +353,7 @@ class DeskApp(tk.Tk):
     def _add_item(self) -> None:
         try:
             item = DeskItem(
-                timestamp=self.time_var.get().strip() or datetime.now().isoformat(),
+                timestamp=self.time_var.get().strip() or _now_iso(),
                 name=self.name_var.get().strip(),
                 x=float(self.x_var.get()),
                 y=float(self.y_var.get()),
@@ -289,7 +373,8 @@ class DeskApp(tk.Tk):
             return
 
         self.items.append(item)
-        self._redraw_canvas()
+        self._items_desc_cache = None
+        self._request_redraw()
         self.status_var.set(f"Added: {item.name}")
         self.name_var.set("")
         self.color_var.set("")
@@ -297,13 +382,13 @@ class DeskApp(tk.Tk):
     def _save_items(self) -> None:
         path = Path(self.path_var.get())
         path.parent.mkdir(parents=True, exist_ok=True)
-        data = [item.to_dict() for item in self.items]
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        try:
-            self.last_loaded_mtime = path.stat().st_mtime
-        except OSError:
-            self.last_loaded_mtime = None
+        raw = _dump_items(self.items)
+        # Write to a sibling temp file and swap it in so the file watch never
+        # sees a half-written file.
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(raw)
+        os.replace(tmp, path)
+        self._remember_file_state(path, _fingerprint(raw))
         self.status_var.set(f"Saved to {path}")
 
     def _load_from_path(self, show_errors: bool = True, show_status: bool = True) -> None:
@@ -312,29 +397,55 @@ class DeskApp(tk.Tk):
             if show_errors:
                 messagebox.showerror("File missing", f"Cannot find {path}")
             return
+        raw = None
         try:
-            with path.open(encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as exc:  # json errors
+            raw = path.read_bytes()
+            items = [_item_from_dict(d) for d in _load_items_data(raw)]
+        except Exception as exc:  # json errors or malformed items
+            if raw is not None:
+                # Remember the broken file so the watch skips it until it changes.
+                self._remember_file_state(path, _fingerprint(raw))
             if show_errors:
                 messagebox.showerror(
                     "Load failed", f"Cannot parse file: {exc}")
             return
 
-        self.items = [DeskItem.from_dict(d) for d in data]
-        try:
-            self.last_loaded_mtime = path.stat().st_mtime
-        except OSError:
-            self.last_loaded_mtime = None
-        self._redraw_canvas()
+        self.items = items
+        self._items_desc_cache = None
+        self._remember_file_state(path, _fingerprint(raw))
+        self._request_redraw()
         if show_status:
             self.status_var.set(f"Loaded {len(self.items)} items from {path}")
 
-    def _redraw_canvas(self) -> None:
-        self.canvas.delete("all")
+    def _remember_file_state(self, path: Path, digest: bytes | None) -> None:
+        try:
+            st = path.stat()
+        except OSError:
+            self.last_loaded_mtime_ns = None
+            self._last_loaded_size = None
+            self._last_loaded_digest = None
+            return
+        self.last_loaded_mtime_ns = st.st_mtime_ns
+        self._last_loaded_size = st.st_size
+        self._last_loaded_digest = digest
+
+    def _request_redraw(self) -> None:
+        # Coalesce redraws so several changes in one event-loop turn paint once.
+        if self._redraw_scheduled:
+            return
+        self._redraw_scheduled = True
+        self.after_idle(self._flush_redraw)
+
+    def _flush_redraw(self) -> None:
+        self._redraw_scheduled = False
+        self._sync_items()
+
+    def _ensure_border(self) -> None:
+        if self._border_id is not None:
+            return
         # Draw a subtle desk border to help orientation.
         margin = 16
-        self.canvas.create_rectangle(
+        self._border_id = self.canvas.create_rectangle(
             margin,
             margin,
             CANVAS_WIDTH - margin,
@@ -343,25 +454,46 @@ class DeskApp(tk.Tk):
             width=2,
         )
 
-        for item in self.items:
-            cx = item.x * CANVAS_WIDTH
-            cy = item.y * CANVAS_HEIGHT
-            self.canvas.create_oval(
-                cx - DOT_RADIUS,
-                cy - DOT_RADIUS,
-                cx + DOT_RADIUS,
-                cy + DOT_RADIUS,
-                fill="white",
-                outline="",
-            )
-            label = f"{item.name} ({item.color})"
-            self.canvas.create_text(
-                cx,
-                cy - DOT_RADIUS - 8,
-                text=label,
-                fill="#d0d0d0",
-                font=(self.base_family, 12),
-            )
+    def _make_sync(self, canvas_width: int, canvas_height: int, dot_r: int, font):
+        # Bake per-session constants into default args so the item loop reads
+        # locals instead of module globals and instance attributes.
+        def sync_items(cw=float(canvas_width), ch=float(canvas_height),
+                       r=dot_r, font=font) -> None:
+            # Only touch canvas items whose data changed since the last sync.
+            self._ensure_border()
+            canvas = self.canvas
+            items = self.items
+            drawn = self._drawn_items
+            ids = self._item_ids
+            for i, item in enumerate(items):
+                if i < len(drawn) and drawn[i] == item:
+                    continue
+                cx = item.x * cw
+                cy = item.y * ch
+                x0 = cx - r
+                y0 = cy - r
+                x1 = cx + r
+                y1 = cy + r
+                ty = y0 - 8
+                label = f"{item.name} ({item.color})" if item.color else item.name
+                if i < len(ids):
+                    oval_id, text_id = ids[i]
+                    canvas.coords(oval_id, x0, y0, x1, y1)
+                    canvas.coords(text_id, cx, ty)
+                    canvas.itemconfigure(text_id, text=label)
+                else:
+                    oval_id = canvas.create_oval(
+                        x0, y0, x1, y1, fill="white", outline="")
+                    text_id = canvas.create_text(
+                        cx, ty, text=label, fill="#d0d0d0", font=font)
+                    ids.append((oval_id, text_id))
+
+            for oval_id, text_id in ids[len(items):]:
+                canvas.delete(oval_id, text_id)
+            del ids[len(items):]
+            self._drawn_items = list(items)
+
+        return sync_items
 
     def _send_question(self) -> None:
         if self.client is None:
@@ -381,90 +513,215 @@ class DeskApp(tk.Tk):
             self._append_chat("Assistant: I don't see any items yet.\n\n")
             return
 
-        messages = self._build_messages(question)
+        messages = self._extend_history(question)
+        self.send_btn.config(state="disabled")
+        self.status_var.set("Waiting for response...")
+        threading.Thread(target=self._call_openai,
+                         args=(messages,), daemon=True).start()
+
+    def _call_openai(self, messages: list[dict]) -> None:
+        # Runs on a worker thread; UI updates are posted back with after().
+        parts: list[str] = []
         try:
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model=MODEL_NAME,
                 messages=messages,
                 temperature=0.2,
+                stream=True,
             )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if not parts:
+                    delta = delta.lstrip()
+                    if not delta:
+                        continue
+                    if not self._post(self._append_chat, "Assistant: "):
+                        return
+                parts.append(delta)
+                if not self._post(self._append_chat, delta):
+                    return
         except Exception as exc:
-            friendly = self._friendly_error(str(exc))
-            self._append_chat(f"Assistant: (error) {friendly}\n\n")
-            self.status_var.set("OpenAI call failed")
+            self._post(self._handle_openai_result, "".join(parts), exc)
             return
+        self._post(self._handle_openai_result, "".join(parts), None)
 
-        content = response.choices[0].message.content.strip()
-        self._append_chat(f"Assistant: {content}\n\n")
+    def _post(self, func, *args) -> bool:
+        # Hand work to the Tk loop from the worker; fails once the window is gone.
+        try:
+            self.after(0, func, *args)
+        except (RuntimeError, tk.TclError):
+            return False
+        return True
+
+    def _handle_openai_result(self, content: str, error: Exception | None) -> None:
+        self.send_btn.config(state="normal")
+        content = content.strip()
+        if error is not None or not content:
+            # Drop the unanswered question so history stays user/assistant pairs.
+            if self._history[-1]["role"] == "user":
+                self._history.pop()
+        if error is not None:
+            friendly = self._friendly_error(str(error))
+            prefix = "\n" if content else "Assistant: "
+            self._append_chat(f"{prefix}(error) {friendly}\n\n")
+            self.status_var.set("OpenAI call failed")
+            return
+        if content:
+            self._history.append({"role": "assistant", "content": content})
+            self._trim_history()
+        else:
+            self._append_chat("Assistant: ")
+        self._append_chat("\n\n")
         self.status_var.set("Response received.")
 
-    def _build_messages(self, question: str):
-        item_lines = []
-        for idx, item in enumerate(self.items, start=1):
-            item_lines.append(
-                f"{idx}. {item.name} | color: {item.color or 'unknown'} | pos: ({item.x:.3f}, {item.y:.3f}) | placed: {item.timestamp}"
-            )
-        items_desc = "\n".join(item_lines) if item_lines else "No items."
-        user_content = (
-            "Current desk items (coords 0-1, origin top-left):\n"
-            f"{items_desc}\n\n"
-            f"Question: {question}"
-        )
-        return [
-            {
+    def _items_desc(self) -> str:
+        # Cached until self.items changes; reset _items_desc_cache on mutation.
+        if self._items_desc_cache is None:
+            item_lines = [
+                _ITEM_ROW % (idx, name, color or "unknown", x, y, timestamp)
+                for idx, (timestamp, name, x, y, color) in enumerate(
+                    map(_ITEM_FIELDS, self.items), start=1)
+            ]
+            self._items_desc_cache = "\n".join(
+                item_lines) if item_lines else "No items."
+        return self._items_desc_cache
+
+    def _extend_history(self, question: str) -> list[dict]:
+        # The items context is only re-sent as a new message when the items
+        # actually changed since the last question.
+        items_hash = hash(tuple(self.items))
+        if items_hash != self._items_hash:
+            # Replace, not accumulate: only the latest snapshot is sent.
+            if self._items_msg is not None:
+                self._history.remove(self._items_msg)
+            self._items_msg = {
                 "role": "system",
-                "content": "You are a concise assistant. Answer only the user's question using the desk items context. Do not add extra commentary.",
-            },
-            {"role": "user", "content": user_content},
-        ]
+                "content": "Current desk items (coords 0-1, origin top-left):\n"
+                + self._items_desc(),
+            }
+            self._history.append(self._items_msg)
+            self._items_hash = items_hash
+        self._history.append({"role": "user", "content": question})
+        self._trim_history()
+        # Copy so the worker thread never sees later appends.
+        return list(self._history)
+
+    def _trim_history(self) -> None:
+        # Drop the oldest turns but keep the system prompt and current items.
+        # A reply whose question was trimmed is dropped too, so the history
+        # never starts with an orphaned assistant turn.
+        history = self._history
+        idx = 1
+        while idx < len(history):
+            msg = history[idx]
+            if msg is self._items_msg:
+                idx += 1
+            elif len(history) > HISTORY_MAX_MESSAGES or msg["role"] == "assistant":
+                del history[idx]
+            else:
+                break
 
     def _append_chat(self, text: str) -> None:
         self.response_box.config(state="normal")
         self.response_box.insert(tk.END, text)
-        self.response_box.see(tk.END)
+        # Keep the widget small; long Text buffers make rewrapping laggy.
+        lines = int(self.response_box.index("end-1c").split(".")[0])
+        if lines > CHAT_MAX_LINES:
+            self.response_box.delete(
+                "1.0", f"{lines - CHAT_MAX_LINES + 1}.0")
         self.response_box.config(state="disabled")
+        if not self._scroll_scheduled:
+            self._scroll_scheduled = True
+            self.after_idle(self._scroll_chat)
+
+    def _scroll_chat(self) -> None:
+        self._scroll_scheduled = False
+        self.response_box.see(tk.END)
 
     def _start_file_watch(self) -> None:
-        # Poll for file changes to auto-refresh items.
-        self.after(1000, self._poll_file_change)
+        # Poll for file changes to auto-refresh items; back off while idle.
+        self.bind("<Map>", self._handle_map)
+        self.bind("<Unmap>", self._handle_map)
+        self.after(self._poll_interval_ms, self._poll_file_change)
+
+    def _handle_map(self, event) -> None:
+        # Child widgets share the root bindtag; only react to the window itself.
+        if event.widget is not self:
+            return
+        self._watch_paused = event.type == tk.EventType.Unmap
+        if not self._watch_paused:
+            self._idle_ticks = 0
+            self._poll_interval_ms = POLL_MIN_MS
 
     def _poll_file_change(self) -> None:
+        if self._watch_paused:
+            self.after(POLL_PAUSED_MS, self._poll_file_change)
+            return
         try:
             path = Path(self.path_var.get())
-            if path.exists():
-                mtime = path.stat().st_mtime
-                if self.last_loaded_mtime is None or mtime > self.last_loaded_mtime:
-                    self._load_from_path(show_errors=False, show_status=True)
+            if self._file_changed(path):
+                self._idle_ticks = 0
+                self._poll_interval_ms = POLL_MIN_MS
+                self._load_from_path(show_errors=False, show_status=True)
+            else:
+                self._idle_ticks += 1
+                self._poll_interval_ms = min(
+                    POLL_MAX_MS, POLL_MIN_MS * 2 ** min(self._idle_ticks, 4))
         except Exception:
             # Avoid crashing UI on watch errors.
             pass
-        self.after(1000, self._poll_file_change)
+        self.after(self._poll_interval_ms, self._poll_file_change)
+
+    def _file_changed(self, path: Path) -> bool:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return False
+        if self.last_loaded_mtime_ns is None:
+            return True
+        if st.st_size != self._last_loaded_size:
+            return True
+        if st.st_mtime_ns == self.last_loaded_mtime_ns:
+            return False
+        # Same size but touched: compare content so rewrites of identical
+        # data (e.g. our own saves) don't trigger a full reload.
+        if self._last_loaded_digest is None:
+            return True
+        if _fingerprint(path.read_bytes()) != self._last_loaded_digest:
+            return True
+        self.last_loaded_mtime_ns = st.st_mtime_ns
+        return False
 
     def _friendly_error(self, msg: str) -> str:
-        lower = msg.lower()
-        if "insufficient_quota" in lower or "quota" in lower:
+        if _QUOTA_RE.search(msg):
             return "API quota exceeded or unavailable. Check billing or use another API key."
-        if "401" in lower or "invalid_api_key" in lower:
+        if _AUTH_RE.search(msg):
             return "API key invalid or missing. Check apu_key.txt or OPENAI_API_KEY."
         return msg
 
     def _init_openai_client(self):
         if OpenAI is None:
             return None
-        if not os.environ.get("OPENAI_API_KEY"):
-            if API_KEY_PATH.exists():
-                try:
-                    key = API_KEY_PATH.read_text(encoding="utf-8").strip()
-                    if key:
-                        os.environ["OPENAI_API_KEY"] = key
-                except Exception:
-                    pass
-        if not os.environ.get("OPENAI_API_KEY"):
-            return None
-        try:
-            return OpenAI()
-        except Exception:
+        key = os.environ.get("OPENAI_API_KEY")
+        if not key:
+            # Single open+read instead of exists() followed by a read.
+            try:
+                key = API_KEY_PATH.read_bytes().decode("utf-8").strip()
+            except (OSError, UnicodeDecodeError):  # Missing or unreadable
+                key = ""
+        if not key:
             return None
+        if key not in DeskApp._client_cache:
+            try:
+                client = OpenAI(api_key=key)
+            except Exception:
+                client = None
+            DeskApp._client_cache[key] = client
+        return DeskApp._client_cache[key]
 
 
 def main():